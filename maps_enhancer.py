@@ -1,12 +1,98 @@
 import os
+import sys
+import csv
+import time
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+import statistics
+from collections import deque
+import httpx
+import diskcache
+import orjson
+from aiolimiter import AsyncLimiter
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 import logging
 import re
 from typing import Optional, Dict, Any
-from urllib.parse import urlparse
-import json
+from functools import lru_cache
+
+# Maximum number of place searches in flight at once
+MAX_CONCURRENCY = 64
+
+# Request quota and adaptive concurrency settings for the async pipeline
+REQUESTS_PER_MINUTE = 600
+MAX_RETRIES = 3
+REQUEST_TIMEOUT = 30.0         # seconds
+MIN_REMAINING_QUOTA = 50       # shrink the request rate when the server reports fewer remaining requests
+RATE_DECREASE = 0.5            # at most once per quota window
+RATE_INCREASE = 0.1            # fraction of the configured rate restored per healthy quota window
+QUOTA_WINDOW = 60.0            # seconds; matches the requests-per-minute bucket
+LATENCY_TARGET = 1.0           # seconds; grow concurrency while median latency stays below this
+AIMD_INCREASE = 0.5
+AIMD_DECREASE = 0.5            # at most once per latency window
+
+# On-disk cache of search responses, keyed by normalized query
+CACHE_DIR = '.places_cache'
+CACHE_EXPIRE = 7 * 86400      # seconds
+
+# Patterns used to clean organization names and normalize cache keys
+_SUFFIX_RE = re.compile(r'\s*(LLC|Inc|Corporation|Corp|Ltd|Limited|Co|Company|Group|Holdings|Services)\.?\s*$', re.IGNORECASE)
+_PUNCT_RE = re.compile(r'[^\w\s-]')
+_QUERY_PUNCT_RE = re.compile(r'[^\w\s]')
+_DOMAIN_RE = re.compile(r'^(?:https?://)?([^/?#]*)')
+
+# Number of CSV rows read and processed at a time
+CHUNK_SIZE = 100_000
+
+# Weekend operation status keyed by (open on Saturday, open on Sunday)
+_WEEKEND_STATUS = {
+    (True, True): 'Operational',
+    (True, False): 'Sat',
+    (False, True): 'Sun',
+    (False, False): 'Not Operational',
+}
+WEEKEND_STATUSES = list(_WEEKEND_STATUS.values())
+
+# Google Maps columns appended to every row, with compact dtypes
+RESULT_DTYPES = {
+    'google_maps_link': 'string',
+    'place_id': 'string',
+    'formatted_address': 'string',
+    'phone_number': 'string',
+    'rating': 'float32',
+    'user_ratings_total': 'Int32',
+    'website': 'string',
+    'business_status': 'string',
+    'weekday_closing': 'string',
+    'weekend_status': pd.CategoricalDtype(WEEKEND_STATUSES),
+    'website_matched': 'boolean',
+}
+
+# Distinct names/URLs remembered by the cached string helpers
+STRING_CACHE_SIZE = 100_000
+
+# Connection pool size for the synchronous requests session, also used as the thread count
+POOL_SIZE = 32
+
+# Places API (v1) fields returned by searchText, so no separate details call is needed
+SEARCH_FIELD_MASK = ','.join([
+    'places.id',
+    'places.displayName',
+    'places.formattedAddress',
+    'places.nationalPhoneNumber',
+    'places.websiteUri',
+    'places.rating',
+    'places.userRatingCount',
+    'places.regularOpeningHours',
+    'places.businessStatus',
+])
 
 # Set up logging with debug level
 logging.basicConfig(
@@ -18,8 +104,141 @@ logging.basicConfig(
     ]
 )
 
+@lru_cache(maxsize=STRING_CACHE_SIZE)
+def _get_domain(url: str) -> str:
+    """Extract domain from URL without scheme, www and path"""
+    domain = _DOMAIN_RE.match(url.lower()).group(1)
+    if domain.startswith('www.'):
+        domain = domain[4:]
+    return domain
+
+@lru_cache(maxsize=STRING_CACHE_SIZE)
+def _clean_org_name(org_name: str) -> str:
+    """Clean up organization name"""
+    # Remove common business suffixes
+    org_name = _SUFFIX_RE.sub('', org_name.strip())
+    # Remove special characters
+    org_name = _PUNCT_RE.sub(' ', org_name)
+    # Remove extra whitespace
+    org_name = ' '.join(org_name.split())
+    return org_name
+
+class RateLimiter:
+    """
+    Async request limiter combining a requests-per-minute token bucket with
+    AIMD concurrency control driven by response status, quota headers and latency.
+    """
+    def __init__(self, requests_per_minute: int, max_concurrency: int):
+        self.max_requests_per_minute = requests_per_minute
+        self.requests_per_minute = requests_per_minute
+        self.limiter = AsyncLimiter(requests_per_minute, 60)
+        self.max_concurrency = max_concurrency
+        self.concurrency = float(max_concurrency)
+        self.in_flight = 0
+        self.condition = asyncio.Condition()
+        self.latencies = deque(maxlen=50)
+        self.last_rate_change = float('-inf')
+        self.last_backoff = float('-inf')
+    
+    async def __aenter__(self):
+        # Wait for a free concurrency slot, then for a rate token
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.in_flight < max(1, int(self.concurrency)))
+            self.in_flight += 1
+        await self.limiter.acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        async with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+    
+    def _remaining_quota(self, headers) -> Optional[int]:
+        """Read the lowest remaining-quota value from headers such as X-RateLimit-Remaining"""
+        remaining = None
+        for name, value in headers.items():
+            if name.lower().endswith('-remaining'):
+                try:
+                    value = int(value)
+                except ValueError:
+                    continue
+                remaining = value if remaining is None else min(remaining, value)
+        return remaining
+    
+    def _set_rate(self, requests_per_minute: float):
+        """Change the limiter rate in place, keeping its current level so a change never admits a burst"""
+        self.requests_per_minute = requests_per_minute
+        # Relies on AsyncLimiter internals (max_rate, _rate_per_sec, _leak), unchanged from the
+        # pinned aiolimiter 1.1.0 through 1.3.0. Leak first so the time since the last acquire
+        # drains at the old rate rather than being re-priced at the new one.
+        self.limiter._leak()
+        self.limiter.max_rate = requests_per_minute
+        self.limiter._rate_per_sec = requests_per_minute / self.limiter.time_period
+    
+    def _latency_window(self) -> float:
+        """Seconds within which responses are treated as one congestion signal"""
+        return statistics.median(self.latencies) if self.latencies else LATENCY_TARGET
+    
+    def observe(self, status: int, headers, latency: float) -> float:
+        """
+        Update the limits from a finished response.
+        Returns the number of seconds to wait before retrying (0 if no retry is needed).
+        """
+        now = time.monotonic()
+        
+        # Cut the request rate at most once per quota window when the server reports low
+        # remaining quota, and restore it gradually while the quota stays healthy
+        remaining = self._remaining_quota(headers)
+        since_rate_change = now - self.last_rate_change
+        if remaining is not None and remaining < MIN_REMAINING_QUOTA:
+            if since_rate_change >= QUOTA_WINDOW and self.requests_per_minute > 1:
+                new_rate = max(1, int(self.requests_per_minute * RATE_DECREASE))
+                logging.warning(f"Remaining quota {remaining}: reducing rate to {new_rate} requests/minute")
+                self._set_rate(new_rate)
+                self.last_rate_change = now
+        elif self.requests_per_minute < self.max_requests_per_minute and since_rate_change >= QUOTA_WINDOW:
+            new_rate = min(self.max_requests_per_minute,
+                           int(self.requests_per_minute + self.max_requests_per_minute * RATE_INCREASE))
+            logging.info(f"Quota recovered: raising rate to {new_rate} requests/minute")
+            self._set_rate(new_rate)
+            self.last_rate_change = now
+        
+        if status == 429:
+            # Multiplicative decrease, applied once per latency window so a burst of
+            # simultaneous 429s counts as a single congestion signal
+            if now - self.last_backoff >= self._latency_window():
+                self.concurrency = max(1.0, self.concurrency * AIMD_DECREASE)
+                self.last_backoff = now
+                logging.warning(f"Rate limited (429): reducing concurrency to {int(self.concurrency)}")
+            try:
+                return float(headers.get('Retry-After', 1))
+            except ValueError:
+                return 1.0
+        
+        # Additive increase while the API stays fast
+        self.latencies.append(latency)
+        if statistics.median(self.latencies) < LATENCY_TARGET:
+            self.concurrency = min(float(self.max_concurrency), self.concurrency + AIMD_INCREASE)
+        return 0.0
+
+class SyncRateLimiter:
+    """Thread-safe limiter that spaces blocking requests evenly to stay within a requests-per-minute quota"""
+    def __init__(self, requests_per_minute: int):
+        self.interval = 60.0 / requests_per_minute
+        self.lock = threading.Lock()
+        self.next_slot = time.monotonic()
+    
+    def acquire(self):
+        # Reserve the next free slot under the lock, then sleep outside it
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
 class MapsEnhancer:
-    def __init__(self):
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY, requests_per_minute: int = REQUESTS_PER_MINUTE):
         # Load environment variables
         load_dotenv()
         
@@ -29,243 +248,469 @@ class MapsEnhancer:
             raise ValueError("Google Maps API key not found in .env file")
         
         # API endpoint
-        self.places_api_url = 'https://maps.googleapis.com/maps/api/place/textsearch/json'
+        self.search_url = 'https://places.googleapis.com/v1/places:searchText'
+        self.search_headers = {
+            'Content-Type': 'application/json',
+            'X-Goog-Api-Key': self.api_key,
+            'X-Goog-FieldMask': SEARCH_FIELD_MASK
+        }
         
-    def _get_domain(self, url: str) -> str:
-        """Extract domain from URL without www and common prefixes"""
-        if not url:
-            return ""
-        try:
-            # Add http:// if no protocol specified
-            if not url.startswith(('http://', 'https://')):
-                url = 'http://' + url
-            
-            parsed = urlparse(url)
-            domain = parsed.netloc.lower()
-            if domain.startswith('www.'):
-                domain = domain[4:]
-            return domain
-        except Exception as e:
-            logging.error(f"Error parsing URL {url}: {str(e)}")
-            return ""
+        # Pooled session so synchronous searches reuse TCP/TLS connections
+        retry = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods=None
+        )
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry))
+        
+        self.sync_limiter = SyncRateLimiter(requests_per_minute)
+        
+        # Cache of search responses so duplicate organizations are not billed twice
+        self.cache = diskcache.Cache(CACHE_DIR)
+        
+        # Search tasks of the current async run, keyed by cache key, shared by identical queries
+        self._in_flight = {}
+        # Same for the thread-pool path: futures keyed by cache key, guarded by a lock
+        self._sync_in_flight = {}
+        self._sync_lock = threading.Lock()
+        
+        # Concurrency and quota limits for the async search pipeline
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute
+        
+    def _clean_org_names(self, org_names: pd.Series) -> pd.Series:
+        """Clean a column of organization names, parsing each distinct name once"""
+        return org_names.map(_clean_org_name, na_action='ignore')
     
-    def _clean_org_name(self, org_name: str) -> str:
-        """Clean up organization name"""
-        org_name = org_name.strip()
-        # Remove common business suffixes
-        suffixes = r'\s*(LLC|Inc|Corporation|Corp|Ltd|Limited|Co|Company|Group|Holdings|Services)\.?\s*$'
-        org_name = re.sub(suffixes, '', org_name, flags=re.IGNORECASE)
-        # Remove special characters
-        org_name = re.sub(r'[^\w\s-]', ' ', org_name)
-        # Remove extra whitespace
-        org_name = ' '.join(org_name.split())
-        return org_name
+    def _get_domains(self, urls: pd.Series) -> pd.Series:
+        """Extract domains from a column of URLs; missing URLs map to an empty string"""
+        return urls.map(_get_domain, na_action='ignore').fillna('').astype('string')
+    
+    def _cache_key(self, search_query: str) -> str:
+        """Normalize a search query so near-duplicate queries share a cache entry"""
+        return ' '.join(_QUERY_PUNCT_RE.sub(' ', search_query.lower()).split())
     
-    def _compare_websites(self, website1: str, website2: str) -> bool:
-        """Compare two website URLs by their domain"""
-        try:
-            domain1 = self._get_domain(website1)
-            domain2 = self._get_domain(website2)
-            return domain1 and domain2 and domain1 == domain2
-        except Exception as e:
-            logging.error(f"Error comparing websites: {str(e)}")
-            return False
-
     def _get_operating_hours(self, opening_hours: dict) -> tuple:
         """Extract weekday closing time and weekend operation status"""
         if not opening_hours or 'periods' not in opening_hours:
             return None, None
         
-        # Initialize variables
-        weekday_close = None
-        saturday_open = False
-        sunday_open = False
+        # Index periods by opening day in one pass, preferring the first period with a closing time
+        by_day = {}
+        for period in opening_hours['periods']:
+            day = period.get('open', {}).get('day')
+            if day not in by_day or 'close' not in by_day[day]:
+                by_day[day] = period
         
         # Get weekday closing time (using Monday-Friday)
-        for day in range(1, 6):  # Monday is 1, Friday is 5
-            for period in opening_hours['periods']:
-                if period.get('open', {}).get('day') == day and 'close' in period:
-                    close_time = period['close']['time']
-                    weekday_close = f"{close_time[:2]}:{close_time[2:]}"
-                    break
-            if weekday_close:  # If we found a closing time, stop checking other days
+        weekday_close = None
+        for day in (1, 2, 3, 4, 5):  # Monday is 1, Friday is 5
+            period = by_day.get(day)
+            if period and 'close' in period:
+                close_time = period['close']['time']
+                weekday_close = f"{close_time[:2]}:{close_time[2:]}"
                 break
         
-        # Check weekend operation
-        for period in opening_hours['periods']:
-            if period.get('open', {}).get('day') == 6:  # Saturday
-                saturday_open = True
-            elif period.get('open', {}).get('day') == 0:  # Sunday
-                sunday_open = True
-        
-        # Determine weekend status
-        if saturday_open and sunday_open:
-            weekend_status = "Operational"
-        elif saturday_open:
-            weekend_status = "Sat"
-        elif sunday_open:
-            weekend_status = "Sun"
-        else:
-            weekend_status = "Not Operational"
+        # Determine weekend status from Saturday (6) and Sunday (0)
+        weekend_status = _WEEKEND_STATUS[(6 in by_day, 0 in by_day)]
         
         return weekday_close, weekend_status
 
+    def _map_place(self, place: dict) -> Dict[str, Any]:
+        """Map a v1 searchText place onto the legacy Places field names used downstream"""
+        opening_hours = {}
+        if 'regularOpeningHours' in place:
+            # v1 periods use {day, hour, minute}; legacy periods use {day, time: 'HHMM'}
+            periods = []
+            for period in place['regularOpeningHours'].get('periods', []):
+                mapped = {}
+                for key in ('open', 'close'):
+                    if key in period:
+                        point = period[key]
+                        mapped[key] = {
+                            'day': point.get('day'),
+                            'time': f"{point.get('hour', 0):02d}{point.get('minute', 0):02d}"
+                        }
+                periods.append(mapped)
+            opening_hours = {'periods': periods}
+        
+        return {
+            'place_id': place.get('id'),
+            'name': place.get('displayName', {}).get('text'),
+            'formatted_address': place.get('formattedAddress'),
+            'formatted_phone_number': place.get('nationalPhoneNumber'),
+            'website': place.get('websiteUri'),
+            'rating': place.get('rating'),
+            'user_ratings_total': place.get('userRatingCount'),
+            'business_status': place.get('businessStatus'),
+            'opening_hours': opening_hours
+        }
+
     def search_place(self, org_name: str, location: str, target_url: str) -> Optional[Dict[str, Any]]:
         """
-        Search for a place using organization name and location using the Places API.
+        Search for a place using organization name and location using the Places API (v1 searchText).
         Returns the matched place details or None if no match found.
         """
         try:
             # Clean organization name
-            org_name = self._clean_org_name(org_name)
-            
-            # Create search query
-            search_query = f"{org_name} {location} USA".strip()
-            logging.debug(f"Search query: {search_query}")
-            
-            # Prepare request parameters
-            params = {
-                'query': search_query,
-                'key': self.api_key
-            }
-            
-            # Make API request
-            logging.debug(f"Making API request to {self.places_api_url}")
-            response = requests.get(self.places_api_url, params=params)
-            logging.debug(f"API Response status: {response.status_code}")
-            
-            if response.status_code != 200:
-                logging.error(f"API request failed: {response.text}")
-                return None
-            
-            # Parse response
-            result = response.json()
-            logging.debug(f"Search API Response: {json.dumps(result, indent=2)}")
-            
-            if result.get('status') != 'OK' or not result.get('results'):
-                logging.warning(f"No places found for query: {search_query}")
-                return None
-            
-            # Get the first result
-            place = result['results'][0]
-            logging.info(f"Found place: {place.get('name')} with place_id: {place.get('place_id')}")
-            
-            # Get place details
-            details_url = 'https://maps.googleapis.com/maps/api/place/details/json'
-            details_params = {
-                'place_id': place['place_id'],
-                'key': self.api_key,
-                'fields': 'name,formatted_phone_number,formatted_address,website,rating,user_ratings_total,reviews,opening_hours,business_status'
-            }
-            
-            details_response = requests.get(details_url, params=details_params)
-            if details_response.status_code == 200:
-                details_result = details_response.json()
-                logging.debug(f"Details API Response: {json.dumps(details_result, indent=2)}")
-                if details_result.get('status') == 'OK':
-                    place.update(details_result.get('result', {}))
-                    return place
+            org_name = _clean_org_name(org_name)
+        except Exception as e:
+            logging.error(f"Error searching for place {org_name}: {str(e)}")
+            return None
+        return self._search_row((None, org_name, location))
+    
+    def _build_query(self, org_name: str, location: str) -> str:
+        """Create the searchText query for a cleaned organization name and location"""
+        search_query = f"{org_name} {location} USA".strip()
+        logging.debug(f"Search query: {search_query}")
+        return search_query
+    
+    def _get_cached(self, search_query: str) -> tuple:
+        """Return (cache_key, cached response or None) for a query"""
+        cache_key = self._cache_key(search_query)
+        result = self.cache.get(cache_key)
+        if result is not None:
+            logging.debug(f"Cache hit for query: {search_query}")
+        return cache_key, result
+    
+    def _set_cached(self, cache_key: str, result: Optional[Dict[str, Any]]):
+        """Cache a successful search response"""
+        if result is not None:
+            self.cache.set(cache_key, result, expire=CACHE_EXPIRE)
+    
+    def _parse_search_result(self, search_query: str, result: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Map the first place of a search response, or return None if the search failed or found nothing"""
+        if result is None:
+            return None
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("Search API Response: %s", result)
+        
+        if not result.get('places'):
+            logging.warning(f"No places found for query: {search_query}")
+            return None
+        
+        # Get the first result
+        place = self._map_place(result['places'][0])
+        logging.info(f"Found place: {place.get('name')} with place_id: {place.get('place_id')}")
+        return place
+    
+    def _search_row(self, row: tuple) -> Optional[Dict[str, Any]]:
+        """Blocking search for one (idx, cleaned org_name, location) row; safe to call from worker threads"""
+        _, org_name, location = row
+        try:
+            search_query = self._build_query(org_name, location)
+            cache_key, result = self._get_cached(search_query)
+            if result is None:
+                result = self._shared_search_sync(search_query, cache_key)
+            return self._parse_search_result(search_query, result)
             
-            return place
+        except Exception as e:
+            logging.error(f"Error searching for place {org_name}: {str(e)}")
+            return None
+    
+    def _shared_search_sync(self, search_query: str, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the response for a query, sharing one API call between threads searching the same
+        cache key; the thread that makes the call caches a successful response once.
+        """
+        with self._sync_lock:
+            future = self._sync_in_flight.get(cache_key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._sync_in_flight[cache_key] = future
+        if not owner:
+            return future.result()
+        
+        try:
+            result = self._post_search_sync(search_query)
+            self._set_cached(cache_key, result)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        future.set_result(result)
+        return result
+    
+    def _post_search_sync(self, search_query: str) -> Optional[Dict[str, Any]]:
+        """Send one searchText request on the pooled requests session, paced by the sync rate limiter"""
+        self.sync_limiter.acquire()
+        logging.debug(f"Making API request to {self.search_url}")
+        response = self.session.post(self.search_url, json={'textQuery': search_query}, headers=self.search_headers)
+        logging.debug(f"API Response status: {response.status_code}")
+        
+        if response.status_code != 200:
+            logging.error(f"API request failed: {response.text}")
+            return None
+        return orjson.loads(response.content)
+    
+    async def _cached_search(self, client: httpx.AsyncClient, limiter: RateLimiter, search_query: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the search response for a query from the cache, an identical request
+        already in flight, or a new API call.
+        """
+        cache_key, result = self._get_cached(search_query)
+        if result is not None:
+            return result
+        
+        if cache_key not in self._in_flight:
+            self._in_flight[cache_key] = asyncio.ensure_future(self._fetch_and_cache(client, limiter, search_query, cache_key))
+        return await self._in_flight[cache_key]
+    
+    async def _fetch_and_cache(self, client: httpx.AsyncClient, limiter: RateLimiter, search_query: str, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Make the API call for a query and cache a successful response once, however many rows await it"""
+        result = await self._post_search(client, limiter, search_query)
+        self._set_cached(cache_key, result)
+        return result
+    
+    async def _post_search(self, client: httpx.AsyncClient, limiter: RateLimiter, search_query: str) -> Optional[Dict[str, Any]]:
+        """Send one searchText request through the rate limiter, retrying on 429"""
+        for attempt in range(MAX_RETRIES + 1):
+            async with limiter:
+                start = time.monotonic()
+                response = await client.post(self.search_url, json={'textQuery': search_query}, headers=self.search_headers)
+                logging.debug(f"API Response status: {response.status_code} ({response.http_version})")
+                retry_after = limiter.observe(response.status_code, response.headers, time.monotonic() - start)
+                if response.status_code == 200:
+                    return orjson.loads(response.content)
+                if response.status_code != 429 or attempt == MAX_RETRIES:
+                    logging.error(f"API request failed: {response.text}")
+                    return None
+            await asyncio.sleep(retry_after)
+        return None
+    
+    async def _search_one(self, client: httpx.AsyncClient, limiter: RateLimiter, row: tuple) -> Optional[Dict[str, Any]]:
+        """
+        Async counterpart of _search_row for one (idx, cleaned org_name, location) row.
+        All rows share one HTTP/2 client, so concurrent requests are multiplexed over a single connection.
+        """
+        _, org_name, location = row
+        try:
+            search_query = self._build_query(org_name, location)
+            result = await self._cached_search(client, limiter, search_query)
+            return self._parse_search_result(search_query, result)
             
         except Exception as e:
             logging.error(f"Error searching for place {org_name}: {str(e)}")
             return None
     
-    def process_csv(self, input_file: str, test_mode: bool = True):
+    def _search_all_sync(self, rows: list) -> list:
+        """Run blocking searches for all rows on a thread pool sharing the pooled requests session"""
+        # Drop futures left over from a previous run
+        self._sync_in_flight.clear()
+        with ThreadPoolExecutor(max_workers=POOL_SIZE) as executor:
+            return list(executor.map(self._search_row, rows))
+    
+    async def _search_all(self, rows: list) -> list:
+        """Run searches for all rows concurrently, bounded by the rate limiter"""
+        limiter = RateLimiter(self.requests_per_minute, self.max_concurrency)
+        # Drop tasks left over from a previous run's event loop
+        self._in_flight.clear()
+        # HTTP/2 multiplexes requests over one connection; the limits only matter
+        # if the server falls back to HTTP/1.1
+        limits = httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency)
+        async with httpx.AsyncClient(http2=True, limits=limits, timeout=REQUEST_TIMEOUT) as client:
+            return await asyncio.gather(*[self._search_one(client, limiter, row) for row in rows])
+    
+    def process_csv(self, input_file: str, test_mode: bool = True, output_format: str = 'csv', use_threads: bool = False):
         """
-        Process the input CSV file and enhance it with Google Maps data.
+        Process the input CSV file in chunks and enhance it with Google Maps data.
         test_mode: If True, only process first 5 rows
+        output_format: 'csv' writes enhanced_<name>.csv; 'parquet' writes a directory
+        of zstd-compressed part files, one per chunk
+        use_threads: If True, search with a thread pool and the blocking requests session
+        instead of the asyncio pipeline
         """
         try:
-            # Read CSV file
-            df = pd.read_csv(input_file)
-            logging.info(f"Loaded CSV file with {len(df)} rows")
+            if output_format == 'csv':
+                output_path = 'enhanced_' + os.path.basename(input_file)
+            elif output_format == 'parquet':
+                output_path = 'enhanced_' + os.path.splitext(os.path.basename(input_file))[0]
+                os.makedirs(output_path, exist_ok=True)
+                # Remove parts left over from a previous run
+                for name in os.listdir(output_path):
+                    if name.startswith('part_') and name.endswith('.parquet'):
+                        os.remove(os.path.join(output_path, name))
+            else:
+                raise ValueError(f"Unsupported output format: {output_format}")
             
             # If in test mode, only process first 5 rows
+            nrows = 5 if test_mode else None
             if test_mode:
-                df = df.head(5)
                 logging.info("Test mode: Processing first 5 rows only")
             
-            # Initialize new columns
-            new_columns = [
-                'google_maps_link',
-                'place_id',
-                'formatted_address',
-                'phone_number',
-                'rating',
-                'user_ratings_total',
-                'website',
-                'business_status',
-                'weekday_closing',
-                'weekend_status',
-                'website_matched'
-            ]
-            for col in new_columns:
-                df[col] = None
-            
-            # Process each row
-            for idx, row in df.iterrows():
-                org_name = row.get('organization_name', '')
-                city = row.get('city', '')
-                state = row.get('state', '')
-                csv_website = row.get('organization_website_url', '')
-                
-                if pd.isna(org_name) or not org_name:
-                    logging.warning(f"Skipping row {idx}: No organization name")
-                    continue
-                
-                # Use city if available, otherwise use state
-                location = city if pd.notna(city) and city else state
-                if pd.isna(location) or not location:
-                    logging.warning(f"Skipping row {idx}: No city or state available")
-                    continue
-                
-                # Search for place
-                place = self.search_place(org_name, location, csv_website)
-                if place:
-                    # Get operating hours
-                    weekday_close, weekend_status = self._get_operating_hours(place.get('opening_hours', {}))
-                    
-                    # Compare websites
-                    place_website = place.get('website', '')
-                    website_matched = self._compare_websites(csv_website, place_website) if csv_website and place_website else False
+            # Stream the CSV file in chunks with the pyarrow reader
+            total_rows = 0
+            writer = None
+            schema = None
+            try:
+                for i, chunk in enumerate(self._read_csv_chunks(input_file, CHUNK_SIZE, nrows)):
+                    logging.info(f"Loaded chunk {i} with {len(chunk)} rows")
+                    enhanced = self._process_chunk(chunk, use_threads)
                     
-                    # Update DataFrame
-                    df.at[idx, 'google_maps_link'] = f"https://www.google.com/maps/place/?q=place_id:{place['place_id']}"
-                    df.at[idx, 'place_id'] = place['place_id']
-                    df.at[idx, 'formatted_address'] = place.get('formatted_address')
-                    df.at[idx, 'phone_number'] = place.get('formatted_phone_number')
-                    df.at[idx, 'rating'] = place.get('rating')
-                    df.at[idx, 'user_ratings_total'] = place.get('user_ratings_total')
-                    df.at[idx, 'website'] = place_website
-                    df.at[idx, 'business_status'] = place.get('business_status')
-                    df.at[idx, 'weekday_closing'] = weekday_close
-                    df.at[idx, 'weekend_status'] = weekend_status
-                    df.at[idx, 'website_matched'] = website_matched
-                    
-                    # Print detailed information for this match
-                    print(f"\nFound match for: {org_name}")
-                    print(f"Place Name: {place.get('name')}")
-                    print(f"Address: {place.get('formatted_address')}")
-                    print(f"Phone: {place.get('formatted_phone_number')}")
-                    print(f"Rating: {place.get('rating')} ({place.get('user_ratings_total')} reviews)")
-                    print(f"Website: {place_website}")
-                    print(f"CSV Website: {csv_website}")
-                    print(f"Website Matched: {'Yes' if website_matched else 'No'}")
-                    print(f"Business Status: {place.get('business_status')}")
-                    print(f"Weekdays Closing: {weekday_close if weekday_close else 'Unknown'}")
-                    print(f"Weekend: {weekend_status}")
-                    print("-" * 80)
+                    # Save enhanced chunk
+                    if output_format == 'parquet':
+                        enhanced.to_parquet(os.path.join(output_path, f'part_{i:05d}.parquet'), compression='zstd', index=False)
+                    else:
+                        table = pa.Table.from_pandas(enhanced, preserve_index=False)
+                        if writer is None:
+                            schema = table.schema
+                            writer = pa_csv.CSVWriter(output_path, schema)
+                        writer.write_table(table.cast(schema))
+                    total_rows += len(chunk)
+            finally:
+                if writer is not None:
+                    writer.close()
             
-            # Save enhanced CSV
-            output_file = 'enhanced_' + os.path.basename(input_file)
-            df.to_csv(output_file, index=False)
-            logging.info(f"Enhanced data saved to {output_file}")
+            logging.info(f"Enhanced data ({total_rows} rows) saved to {output_path}")
             
         except Exception as e:
             logging.error(f"Error processing CSV file: {str(e)}")
             raise
+    
+    def _read_csv_chunks(self, input_file: str, chunk_size: int, nrows: Optional[int] = None):
+        """
+        Yield the CSV file as DataFrames of up to chunk_size rows with Arrow-backed columns.
+        All columns are read as strings so every chunk has the same schema.
+        """
+        with open(input_file, newline='', encoding='utf-8-sig') as f:
+            header = next(csv.reader(f))
+        
+        # Rename duplicate column names to name.1, name.2, ... as pandas does
+        columns = []
+        for column in header:
+            name, count = column, 0
+            while name in columns:
+                count += 1
+                name = f"{column}.{count}"
+            columns.append(name)
+        read_options = pa_csv.ReadOptions(column_names=columns, skip_rows=1)
+        convert_options = pa_csv.ConvertOptions(
+            column_types={column: pa.string() for column in columns},
+            strings_can_be_null=True
+        )
+        # Quoted fields may contain newlines (e.g. multi-line addresses); without this the
+        # parser loses sync when such a field spans a block boundary
+        parse_options = pa_csv.ParseOptions(newlines_in_values=True)
+        reader = pa_csv.open_csv(input_file, read_options=read_options, parse_options=parse_options,
+                                 convert_options=convert_options)
+        
+        def to_frame(table: pa.Table, start: int) -> pd.DataFrame:
+            # Number rows across chunks, as pandas chunked reading does
+            df = table.to_pandas(types_mapper=pd.ArrowDtype)
+            df.index = pd.RangeIndex(start, start + len(df))
+            return df
+        
+        pending = []
+        pending_rows = 0
+        emitted = 0
+        for batch in reader:
+            if nrows is not None:
+                batch = batch.slice(0, nrows - emitted - pending_rows)
+            pending.append(batch)
+            pending_rows += batch.num_rows
+            
+            if pending_rows >= chunk_size:
+                table = pa.Table.from_batches(pending)
+                while table.num_rows >= chunk_size:
+                    yield to_frame(table.slice(0, chunk_size), emitted)
+                    emitted += chunk_size
+                    table = table.slice(chunk_size)
+                pending = table.to_batches()
+                pending_rows = table.num_rows
+            
+            if nrows is not None and emitted + pending_rows >= nrows:
+                break
+        
+        if pending_rows:
+            yield to_frame(pa.Table.from_batches(pending), emitted)
+        elif emitted == 0:
+            # Header-only input: still yield one empty chunk so the output gets its header
+            yield to_frame(reader.schema.empty_table(), 0)
+    
+    def _process_chunk(self, df: pd.DataFrame, use_threads: bool = False) -> pd.DataFrame:
+        """Search every row of a chunk and return it with the Google Maps columns appended"""
+        # Find rows with enough data to search before spending any API calls
+        row_data = df.reindex(columns=['organization_name', 'city', 'state', 'organization_website_url']).fillna('')
+        has_name = row_data['organization_name'].ne('')
+        # Use city if available, otherwise use state
+        row_data['location'] = row_data['city'].where(row_data['city'].ne(''), row_data['state'])
+        has_location = row_data['location'].ne('')
+        for idx in df.index[~has_name]:
+            logging.warning(f"Skipping row {idx}: No organization name")
+        for idx in df.index[has_name & ~has_location]:
+            logging.warning(f"Skipping row {idx}: No city or state available")
+        todo = row_data[has_name & has_location]
+        
+        # Clean organization names and extract CSV website domains for the searchable rows only
+        clean_names = self._clean_org_names(todo['organization_name'])
+        csv_domains = self._get_domains(todo['organization_website_url'])
+        rows = list(zip(todo.index, clean_names, todo['location']))
+        row_info = dict(zip(todo.index, zip(todo['organization_name'], todo['organization_website_url'])))
+        
+        # Search all places concurrently
+        if use_threads:
+            places = self._search_all_sync(rows)
+        else:
+            places = asyncio.run(self._search_all(rows))
+        
+        # Process each result
+        records = {}
+        matches = []
+        for (idx, _, _), place in zip(rows, places):
+            if place:
+                # Get operating hours
+                weekday_close, weekend_status = self._get_operating_hours(place.get('opening_hours', {}))
+                
+                records[idx] = {
+                    'google_maps_link': f"https://www.google.com/maps/place/?q=place_id:{place['place_id']}",
+                    'place_id': place['place_id'],
+                    'formatted_address': place.get('formatted_address'),
+                    'phone_number': place.get('formatted_phone_number'),
+                    'rating': place.get('rating'),
+                    'user_ratings_total': place.get('user_ratings_total'),
+                    'website': place.get('website'),
+                    'business_status': place.get('business_status'),
+                    'weekday_closing': weekday_close,
+                    'weekend_status': weekend_status
+                }
+                matches.append((idx, place))
+        
+        result_df = pd.DataFrame.from_dict(records, orient='index', columns=list(RESULT_DTYPES), dtype=object)
+        result_df = result_df.reindex(df.index).astype(RESULT_DTYPES)
+        
+        # Compare CSV and Google website domains for all matched rows at once
+        gmaps_domains = self._get_domains(result_df['website'])
+        csv_domains = csv_domains.reindex(df.index, fill_value='')
+        website_matched = csv_domains.eq(gmaps_domains) & csv_domains.ne('')
+        result_df['website_matched'] = website_matched.astype('boolean').where(result_df['place_id'].notna())
+        
+        # Print detailed information for each match in a single write
+        lines = []
+        for idx, place in matches:
+            org_name, csv_website = row_info[idx]
+            weekday_close = result_df.at[idx, 'weekday_closing']
+            lines.append("")
+            lines.append(f"Found match for: {org_name}")
+            lines.append(f"Place Name: {place.get('name')}")
+            lines.append(f"Address: {place.get('formatted_address')}")
+            lines.append(f"Phone: {place.get('formatted_phone_number')}")
+            lines.append(f"Rating: {place.get('rating')} ({place.get('user_ratings_total')} reviews)")
+            lines.append(f"Website: {place.get('website')}")
+            lines.append(f"CSV Website: {csv_website}")
+            lines.append(f"Website Matched: {'Yes' if result_df.at[idx, 'website_matched'] else 'No'}")
+            lines.append(f"Business Status: {place.get('business_status')}")
+            lines.append(f"Weekdays Closing: {weekday_close if pd.notna(weekday_close) else 'Unknown'}")
+            lines.append(f"Weekend: {result_df.at[idx, 'weekend_status']}")
+            lines.append("-" * 80)
+        
+        if lines:
+            sys.stdout.write('\n'.join(lines) + '\n')
+            sys.stdout.flush()
+        
+        # Append the results to the original columns
+        return pd.concat([df, result_df], axis=1)
 
 def main():
     try: